@@ -1,4 +1,8 @@
+import random
+
 from algorithms import PushyPassenger, RandomAlgorithm, ShortSighted, RandomArrivals, FileArrivals
+from algorithms import Direction, MovingAlgorithm
+from entities import Person, WaitingFloors
 from simulation import Simulation
 from hypothesis import given
 from hypothesis.strategies import integers
@@ -36,6 +40,72 @@ def test_random_arrival_generator_zero() -> None:
             assert p.start != p.target
 
 
+def test_random_arrival_generator_two_floors() -> None:
+    """Test the random arrival generator with only two floors, where every
+    person must go to the other floor.
+    """
+    # Both a round small enough to sample each person directly, and a
+    # vectorized one.
+    for num_people in [3, 50]:
+        arrivals = RandomArrivals(2, num_people).generate(0)
+        all_people = []
+        for people in arrivals.values():
+            all_people.extend(people)
+
+        assert len(all_people) == num_people
+        for p in all_people:
+            assert (p.start, p.target) in [(1, 2), (2, 1)]
+
+
+def test_random_arrival_generator_uniform() -> None:
+    """Test that every (start, target) pair is about equally likely."""
+    max_floor = 3
+    num_people = 3000
+    random.seed(2019)
+    arrivals = RandomArrivals(max_floor, num_people).generate(0)
+    counts = {}
+    for people in arrivals.values():
+        for p in people:
+            counts[(p.start, p.target)] = counts.get((p.start, p.target), 0) + 1
+
+    # There are 6 possible pairs; each is expected 500 times, and a
+    # deviation of 100 is about five standard deviations.
+    assert len(counts) == max_floor * (max_floor - 1)
+    for count in counts.values():
+        assert abs(count - num_people / len(counts)) < 100
+
+
+def test_random_arrival_generator_seeded() -> None:
+    """Test that seeding the random module makes arrivals reproducible,
+    whether it is seeded before or after the generator is created.
+    """
+    results = []
+    for _ in range(2):
+        random.seed(2019)
+        arrivals = RandomArrivals(10, 20).generate(0)
+        results.append(sorted((p.start, p.target)
+                              for people in arrivals.values()
+                              for p in people))
+    generator = RandomArrivals(10, 20)
+    for _ in range(2):
+        random.seed(2019)
+        arrivals = generator.generate(0)
+        results.append(sorted((p.start, p.target)
+                              for people in arrivals.values()
+                              for p in people))
+    assert results[0] == results[1] == results[2] == results[3]
+
+    # A round small enough to sample each person's floors directly.
+    small_results = []
+    for _ in range(2):
+        random.seed(2019)
+        arrivals = RandomArrivals(10, 2).generate(0)
+        small_results.append(sorted((p.start, p.target)
+                                    for people in arrivals.values()
+                                    for p in people))
+    assert small_results[0] == small_results[1]
+
+
 def test_file_arrival_generator() -> None:
     """Test the CSV arrival generator for the given sample_arrivals file.
     """
@@ -187,6 +257,233 @@ def test_short_sighted_moving_algorithm() -> None:
     assert results['avg_time'] == 4
 
 
+class _StayAlgorithm(MovingAlgorithm):
+    """A moving algorithm written against the three-argument interface,
+    which never moves any elevator.
+    """
+
+    def move_elevators(self, elevators, waiting, max_floor):
+        return [Direction.STAY for _ in elevators]
+
+
+class _WrappedShortSighted(ShortSighted):
+    """A ShortSighted subclass that overrides move_elevators with the
+    three-argument interface.
+    """
+
+    def move_elevators(self, elevators, waiting, max_floor):
+        return super().move_elevators(elevators, waiting, max_floor)
+
+
+class _OldStylePushy(MovingAlgorithm):
+    """A pushy passenger algorithm that calls the MovingAlgorithm and
+    PushyPassenger helpers with the waiting dictionary, as they were
+    originally written.
+    """
+
+    def move_elevators(self, elevators, waiting, max_floor):
+        directions = []
+        for elevator in elevators:
+            if not elevator.is_empty():
+                target = elevator.passengers[0].target
+            elif self._is_people_waiting(waiting):
+                target = PushyPassenger._get_lowest_floor_with_people(waiting)
+            else:
+                target = elevator.current_floor
+            directions.append(Direction(elevator.get_direction(target)))
+        return directions
+
+
+def _csv_simulation(csv_file, algorithm, num_elevators: int = 1,
+                    capacity: int = 1) -> Simulation:
+    """Return a simulation of a 5 floor building with arrivals from the
+    given CSV file, moving its elevators with the given algorithm.
+    """
+    config = {
+        'num_floors': 5,
+        'num_elevators': num_elevators,
+        'elevator_capacity': capacity,
+        'num_people_per_round': None,
+        'arrival_generator': FileArrivals(5, str(csv_file)),
+        'moving_algorithm': algorithm,
+        'visualize': False
+    }
+    return Simulation(config)
+
+
+def test_three_argument_moving_algorithms(tmp_path) -> None:
+    """Test that moving algorithms only implementing
+    move_elevators(elevators, waiting, max_floor), or calling the helpers
+    with the waiting dictionary, still work.
+    """
+    empty = WaitingFloors(5)
+    assert not MovingAlgorithm._is_people_waiting(empty)
+    assert PushyPassenger._get_lowest_floor_with_people(empty) == 5
+
+    csv_file = tmp_path / 'arrivals.csv'
+    csv_file.write_text('0, 1, 3\n1, 2, 4\n')
+    # Once everyone has arrived, the moving elevators stay on floor 4.
+    for algorithm, completed, floor in [(_StayAlgorithm(), 0, 1),
+                                        (_WrappedShortSighted(), 2, 4),
+                                        (_OldStylePushy(), 2, 4)]:
+        sim = _csv_simulation(csv_file, algorithm, capacity=2)
+        results = sim.run(10)
+        assert results['total_people'] == 2
+        assert results['people_completed'] == completed
+        assert sim.elevators[0].current_floor == floor
+
+
+def _check_occupied_floors(sim: Simulation) -> None:
+    """Check that the occupied floors tracked by sim match its waiting
+    queues.
+    """
+    waiting = sim.waiting
+    assert waiting.occupied_floors == [floor for floor in sorted(waiting)
+                                       if waiting[floor]]
+
+
+def test_occupied_floors_arrival_on_occupied_floor(tmp_path) -> None:
+    """Test a floor that gains arrivals while people are already waiting."""
+    csv_file = tmp_path / 'arrivals.csv'
+    csv_file.write_text('0, 3, 1\n1, 3, 2, 4, 1\n')
+    sim = _csv_simulation(csv_file, _StayAlgorithm())
+    sim.run(2)
+    assert len(sim.waiting[3]) == 2
+    assert sim.waiting.occupied_floors == [3, 4]
+    _check_occupied_floors(sim)
+
+
+def test_occupied_floors_full_elevator(tmp_path) -> None:
+    """Test a full elevator leaving people behind on its floor."""
+    csv_file = tmp_path / 'arrivals.csv'
+    csv_file.write_text('0, 1, 3, 1, 4, 1, 5\n')
+    sim = _csv_simulation(csv_file, _StayAlgorithm())
+    sim.run(1)
+    assert len(sim.elevators[0].passengers) == 1
+    assert len(sim.waiting[1]) == 2
+    assert sim.waiting.occupied_floors == [1]
+    _check_occupied_floors(sim)
+
+
+def test_occupied_floors_two_elevators_same_floor(tmp_path) -> None:
+    """Test two elevators on the same floor boarding everyone there in one
+    round, both when each takes a person and when the first takes everyone.
+    """
+    csv_file = tmp_path / 'arrivals.csv'
+    csv_file.write_text('0, 1, 3, 1, 4, 2, 5\n')
+    for capacity, loads in [(1, [1, 1]), (2, [2, 0])]:
+        sim = _csv_simulation(csv_file, _StayAlgorithm(), 2, capacity)
+        sim.run(1)
+        assert [len(e.passengers) for e in sim.elevators] == loads
+        assert sim.waiting.occupied_floors == [2]
+        _check_occupied_floors(sim)
+
+
+class _WaitRecorder(_StayAlgorithm):
+    """A moving algorithm that never moves any elevator, and records the
+    wait times of the people waiting each time it is asked to move.
+
+    === Attributes ===
+    seen: the wait times of the waiting people at each call, in arrival order
+    """
+
+    def __init__(self) -> None:
+        self.seen = []
+
+    def move_elevators(self, elevators, waiting, max_floor):
+        self.seen.append([p.wait_time for floor in sorted(waiting)
+                          for p in waiting[floor]])
+        return super().move_elevators(elevators, waiting, max_floor)
+
+
+def test_wait_times_current_during_run(tmp_path) -> None:
+    """Test that moving algorithms see up-to-date wait times in a run that
+    is not visualized.
+    """
+    csv_file = tmp_path / 'arrivals.csv'
+    csv_file.write_text('0, 5, 1\n2, 5, 1\n')
+    recorder = _WaitRecorder()
+    sim = _csv_simulation(csv_file, recorder)
+    sim.run(4)
+    assert recorder.seen == [[0], [1], [2, 0], [3, 1]]
+    assert [p.wait_time for p in sim.waiting[5]] == [4, 2]
+
+
+def test_short_sighted_closest_waiting_floor() -> None:
+    """Test the closest waiting floor chosen by the short-sighted algorithm,
+    including the tie break towards the lower floor.
+    """
+    def closest(current, occupied):
+        """Return the closest waiting floor to current when the given
+        floors of a 9 floor building are occupied, checking that a plain
+        dictionary and a WaitingFloors agree.
+        """
+        plain = {floor: [] for floor in range(1, 10)}
+        tracked = WaitingFloors(9)
+        for floor in occupied:
+            person = Person(floor, 1 if floor != 1 else 2)
+            plain[floor].append(person)
+            tracked.add_person(floor, person)
+        floor = ShortSighted._get_closest_waiting_floor(current, plain)
+        assert ShortSighted._get_closest_waiting_floor(current, tracked) \
+            == floor
+        return floor
+
+    # The current floor is occupied.
+    assert closest(5, [2, 5, 8]) == 5
+    # The current floor is below every occupied floor.
+    assert closest(2, [4, 7]) == 4
+    # The current floor is above every occupied floor.
+    assert closest(8, [2, 5]) == 5
+    # The current floor is exactly between two occupied floors.
+    assert closest(5, [1, 3, 7, 9]) == 3
+    # The current floor is between two occupied floors, closer to one.
+    assert closest(5, [4, 7]) == 4
+    assert closest(5, [3, 6]) == 6
+    # Only one floor is occupied.
+    assert closest(1, [9]) == 9
+
+
+def test_stats_exact_times(tmp_path) -> None:
+    """Test the exact wait time statistics of a short run.
+
+    The three people complete their rides after waiting 2, 1, and 5 rounds,
+    in that order, so both the minimum and the maximum change after the
+    first completion.
+    """
+    csv_file = tmp_path / 'arrivals.csv'
+    csv_file.write_text('0, 1, 3\n2, 3, 2\n3, 1, 5\n')
+    results = _csv_simulation(csv_file, ShortSighted()).run(15)
+    assert results['total_people'] == 3
+    assert results['people_completed'] == 3
+    assert results['max_time'] == 5
+    assert results['min_time'] == 1
+    assert results['avg_time'] == 2
+
+
+def test_stats_single_completion(tmp_path) -> None:
+    """Test the statistics when exactly one person completes their ride."""
+    csv_file = tmp_path / 'arrivals.csv'
+    csv_file.write_text('0, 1, 2\n')
+    results = _csv_simulation(csv_file, ShortSighted()).run(5)
+    assert results['people_completed'] == 1
+    assert results['max_time'] == 1
+    assert results['min_time'] == 1
+    assert results['avg_time'] == 1
+
+
+def test_stats_no_completions(tmp_path) -> None:
+    """Test that the time statistics are -1 when nobody completes."""
+    csv_file = tmp_path / 'arrivals.csv'
+    csv_file.write_text('0, 3, 1\n')
+    results = _csv_simulation(csv_file, _StayAlgorithm()).run(5)
+    assert results['total_people'] == 1
+    assert results['people_completed'] == 0
+    assert results['max_time'] == -1
+    assert results['min_time'] == -1
+    assert results['avg_time'] == -1
+
+
 if __name__ == '__main__':
     import pytest
     pytest.main(['a1_sample_test.py'])
@@ -1,9 +1,12 @@
+from bisect import bisect_left
 import csv
 from enum import Enum
 import random
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
 
-from entities import Person, Elevator
+import numpy as np
+
+from entities import Person, Elevator, WaitingFloors
 
 
 ###############################################################################
@@ -56,8 +59,17 @@ class RandomArrivals(ArrivalGenerator):
     as ArrivalGenerator. So if you choose to to override the initializer, make
     sure to keep the header the same!
 
-    Hint: look up the 'sample' function from random.
+    For small rounds, each person's floors are picked with random.sample.
+    From _VECTORIZE_THRESHOLD people on, all start and target floors are
+    drawn in two vectorized calls to a NumPy generator instead. Each target
+    is then its start shifted by a random non-zero offset (wrapping around
+    the building), so start != target always holds. The generator is seeded
+    from the random module on every call to generate, so random.seed makes
+    the arrivals reproducible no matter when it is called.
     """
+    # Below this many people, setting up the NumPy generator and arrays costs
+    # more than sampling each person's floors directly.
+    _VECTORIZE_THRESHOLD = 16
 
     def generate(self, round_num: int) -> Dict[int, List[Person]]:
         """Return the new arrivals for the simulation at the given round.
@@ -68,14 +80,17 @@ class RandomArrivals(ArrivalGenerator):
         people_waiting = {}
         if self.num_people is None:
             return people_waiting
-        info = []
-        for dummy in range(self.num_people):
-            info.append(tuple(random.sample(range(1, self.max_floor + 1), 2)))
-        for start, target in info:
-            if start in people_waiting:
-                people_waiting[start].append(Person(start, target))
-            else:
-                people_waiting[start] = [Person(start, target)]
+        if self.num_people < self._VECTORIZE_THRESHOLD:
+            floors = range(1, self.max_floor + 1)
+            pairs = [random.sample(floors, 2) for _ in range(self.num_people)]
+        else:
+            rng = np.random.default_rng(random.getrandbits(64))
+            starts = rng.integers(1, self.max_floor + 1, self.num_people)
+            offsets = rng.integers(1, self.max_floor, self.num_people)
+            targets = (starts - 1 + offsets) % self.max_floor + 1
+            pairs = zip(starts.tolist(), targets.tolist())
+        for start, target in pairs:
+            people_waiting.setdefault(start, []).append(Person(start, target))
 
         return people_waiting
 
@@ -84,10 +99,12 @@ class FileArrivals(ArrivalGenerator):
     """Generate arrivals from a CSV file.
 
     === Attributes ===
-    _data_store: Stores all the info from the CSV file.
+    _data_store: Stores all the info from the CSV file, already grouped by
+                 round: each round number maps a starting floor to the
+                 target floors of the people who arrive there.
     """
 
-    _data_store: Dict[int, List[Tuple[int, int]]]
+    _data_store: Dict[int, Dict[int, List[int]]]
 
     def __init__(self, max_floor: int, filename: str) -> None:
         """Initialize a new FileArrivals algorithm from the given file.
@@ -108,26 +125,23 @@ class FileArrivals(ArrivalGenerator):
             reader = csv.reader(csvfile)
             for line in reader:
                 clean = [int(i) for i in line]
-                self._data_store[clean[0]] = [(clean[i], clean[i + 1])
-                                              for i in range(1, len(clean), 2)]
+                by_floor = {}
+                for i in range(1, len(clean), 2):
+                    by_floor.setdefault(clean[i], []).append(clean[i + 1])
+                self._data_store[clean[0]] = by_floor
 
     def generate(self, round_num: int) -> Dict[int, List[Person]]:
         """Return the new arrivals for the simulation at the given round.
 
         The returned dictionary maps floor number to the people who
         arrived starting at that floor.
-        """
-        people_waiting = {}
-        if round_num not in self._data_store:
-            return people_waiting
-        info = self._data_store[round_num]
-        for start, target in info:
-            if start in people_waiting:
-                people_waiting[start].append(Person(start, target))
-            else:
-                people_waiting[start] = [Person(start, target)]
 
-        return people_waiting
+        New Person objects are created on every call, since the simulation
+        mutates them (wait times, sprite positions) as it runs.
+        """
+        by_floor = self._data_store.get(round_num, {})
+        return {start: [Person(start, target) for target in targets]
+                for start, targets in by_floor.items()}
 
 ###############################################################################
 # Elevator moving algorithms
@@ -147,19 +161,26 @@ class Direction(Enum):
     DOWN = -1
 
 
+# Lookup table from an integer direction (-1, 0, 1), offset by one, to the
+# corresponding Direction.
+_DIR_LUT = (Direction.DOWN, Direction.STAY, Direction.UP)
+
+
 class MovingAlgorithm:
     """An algorithm to make decisions for moving an elevator at each round.
     """
 
     def move_elevators(self,
                        elevators: List[Elevator],
-                       waiting: Dict[int, List[Person]],
+                       waiting: Dict[int, Deque[Person]],
                        max_floor: int) -> List[Direction]:
         """Return a list of directions for each elevator to move to.
 
         As input, this method receives the list of elevators in the simulation,
-        a dictionary mapping floor number to a list of people waiting on
+        a dictionary mapping floor number to a queue of people waiting on
         that floor, and the maximum floor number in the simulation.
+        The waiting dictionary belongs to the simulation and should not be
+        modified.
 
         Note that each returned direction should be valid:
             - An elevator at Floor 1 cannot move down.
@@ -168,24 +189,26 @@ class MovingAlgorithm:
         raise NotImplementedError
 
     @staticmethod
-    def _is_people_waiting(waiting: Dict[int, List[Person]]) -> bool:
-        """Help function; checks if there are any people waiting on any
-        of the floors.
+    def _get_occupied_floors(waiting: Dict[int, Deque[Person]]
+                             ) -> Tuple[int, ...]:
+        """Helper function; returns the floors with people waiting in
+        increasing order.
+
+        A WaitingFloors already keeps track of these, so they are only
+        computed from scratch for other dictionaries. A tuple is returned so
+        that callers cannot change the simulation's own list.
         """
-        for arr in waiting.values():
-            if len(arr) != 0:
-                return True
-        return False
+        if isinstance(waiting, WaitingFloors):
+            return tuple(waiting.occupied_floors)
+        return tuple(sorted(floor for floor, people in waiting.items()
+                            if people))
 
     @staticmethod
-    def _options(value: int) -> Direction:
-        """Helper function; returns a Direction object based on an integer."""
-        options = {
-            1: Direction.UP,
-            0: Direction.STAY,
-            -1: Direction.DOWN
-        }
-        return options[value]
+    def _is_people_waiting(waiting: Dict[int, Deque[Person]]) -> bool:
+        """Help function; checks if there are any people waiting on any
+        of the floors.
+        """
+        return len(MovingAlgorithm._get_occupied_floors(waiting)) != 0
 
 
 class RandomAlgorithm(MovingAlgorithm):
@@ -194,17 +217,17 @@ class RandomAlgorithm(MovingAlgorithm):
 
     def move_elevators(self,
                        elevators: List[Elevator],
-                       waiting: Dict[int, List[Person]],
+                       waiting: Dict[int, Deque[Person]],
                        max_floor: int) -> List[Direction]:
         """Moves elevators at random."""
         ret = []
         for elevator in elevators:
             if elevator.current_floor == 1:
-                ret.append(self._options(random.randint(0, 1)))
+                ret.append(_DIR_LUT[random.randint(0, 1) + 1])
             elif elevator.current_floor == max_floor:
-                ret.append(self._options(random.randint(-1, 0)))
+                ret.append(_DIR_LUT[random.randint(-1, 0) + 1])
             else:
-                ret.append(self._options(random.randint(-1, 1)))
+                ret.append(_DIR_LUT[random.randint(-1, 1) + 1])
         return ret
 
 
@@ -220,7 +243,7 @@ class PushyPassenger(MovingAlgorithm):
 
     def move_elevators(self,
                        elevators: List[Elevator],
-                       waiting: Dict[int, List[Person]],
+                       waiting: Dict[int, Deque[Person]],
                        max_floor: int) -> List[Direction]:
         """Moves elevator in accordance with the push passenger algorithm."""
         direction_list = []
@@ -232,24 +255,24 @@ class PushyPassenger(MovingAlgorithm):
             if elevator.is_empty():
                 if people_waiting:
                     direction_list.append(
-                        self._options(elevator.get_direction(lowest_floor)))
+                        _DIR_LUT[elevator.get_direction(lowest_floor) + 1])
                 else:
-                    direction_list.append(self._options(0))
+                    direction_list.append(Direction.STAY)
             else:
                 target_floor = elevator.passengers[0].target
                 direction_list.append(
-                    self._options(elevator.get_direction(target_floor)))
+                    _DIR_LUT[elevator.get_direction(target_floor) + 1])
 
         return direction_list
 
     @staticmethod
-    def _get_lowest_floor_with_people(waiting: Dict[int, List[Person]]) -> int:
-        """Returns the lowest floor with people waiting."""
-        lowest_floor = max([*waiting])
-        for floor in [*waiting]:
-            if waiting[floor] != [] and floor < lowest_floor:
-                lowest_floor = floor
-        return lowest_floor
+    def _get_lowest_floor_with_people(waiting: Dict[int, Deque[Person]]
+                                      ) -> int:
+        """Returns the lowest floor with people waiting, or the highest
+        floor if there are no people waiting.
+        """
+        occupied_floors = MovingAlgorithm._get_occupied_floors(waiting)
+        return occupied_floors[0] if occupied_floors else max(waiting)
 
 
 class ShortSighted(MovingAlgorithm):
@@ -266,47 +289,62 @@ class ShortSighted(MovingAlgorithm):
 
     def move_elevators(self,
                        elevators: List[Elevator],
-                       waiting: Dict[int, List[Person]],
+                       waiting: Dict[int, Deque[Person]],
                        max_floor: int) -> List[Direction]:
         """Moves elevator in accordance with the short-sighted algorithm."""
         direction_list = []
-        people_waiting = self._is_people_waiting(waiting)
+        occupied_floors = self._get_occupied_floors(waiting)
+        people_waiting = len(occupied_floors) != 0
         for elevator in elevators:
             current = elevator.current_floor
             if elevator.is_empty():
                 if people_waiting:
-                    closest = self._get_closest_waiting_floor(current, waiting)
+                    closest = self._get_closest_occupied_floor(
+                        current, occupied_floors)
                     direction_list.append(
-                        self._options(elevator.get_direction(closest)))
+                        _DIR_LUT[elevator.get_direction(closest) + 1])
                 else:
-                    direction_list.append(self._options(0))
+                    direction_list.append(Direction.STAY)
             else:
                 target = self._get_closest_target_floor(elevator)
                 direction_list.append(
-                    self._options(elevator.get_direction(target)))
+                    _DIR_LUT[elevator.get_direction(target) + 1])
 
         return direction_list
 
     @staticmethod
     def _get_closest_waiting_floor(current: int,
-                                   waiting: Dict[int, List[Person]]) -> int:
+                                   waiting: Dict[int, Deque[Person]]) -> int:
         """Finds the closest floor with people waiting given the elevator's
         current floor.
 
         In the event of the two closest floors being equidistant, the lower
         floor is returned.
+
+        Precondition:
+            at least one person is waiting
         """
-        floors_with_waiting = []
-        for floor in [*waiting]:
-            if waiting[floor]:
-                floors_with_waiting.append(floor)
-        closest = floors_with_waiting[0]
-        for floor in floors_with_waiting[1:]:
-            if abs(floor - current) < abs(closest - current):
-                closest = floor
-            elif abs(floor - current) == abs(closest - current):
-                closest = min(floor, closest)
-        return closest
+        return ShortSighted._get_closest_occupied_floor(
+            current, ShortSighted._get_occupied_floors(waiting))
+
+    @staticmethod
+    def _get_closest_occupied_floor(current: int,
+                                    occupied_floors: Tuple[int, ...]) -> int:
+        """Finds the closest of the given occupied floors to the elevator's
+        current floor.
+
+        Since occupied_floors is sorted, only the occupied floors directly
+        below and at or above the current floor need to be compared.
+
+        In the event of the two closest floors being equidistant, the lower
+        floor is returned.
+
+        Precondition:
+            len(occupied_floors) >= 1
+        """
+        i = bisect_left(occupied_floors, current)
+        return ShortSighted._closest_floor(
+            current, occupied_floors[max(i - 1, 0):i + 1])
 
     @staticmethod
     def _get_closest_target_floor(elevator: Elevator) -> int:
@@ -315,15 +353,29 @@ class ShortSighted(MovingAlgorithm):
         In the event of the two closest floors being equidistant, the lower
         floor is returned.
         """
-        current = elevator.current_floor
-        target = elevator.passengers[0].target
-        for passenger in elevator.passengers[1:]:
-            passenger_floor = passenger.target
-            if abs(passenger_floor - current) < abs(target - current):
-                target = passenger_floor
-            elif abs(passenger_floor - current) == abs(target - current):
-                target = min(passenger_floor, target)
-        return target
+        return ShortSighted._closest_floor(
+            elevator.current_floor,
+            [passenger.target for passenger in elevator.passengers])
+
+    @staticmethod
+    def _closest_floor(current: int, candidates: Sequence[int]) -> int:
+        """Returns the floor in candidates closest to the current floor.
+
+        In the event of the two closest floors being equidistant, the lower
+        floor is returned.
+
+        Precondition:
+            len(candidates) >= 1
+        """
+        closest = candidates[0]
+        closest_distance = abs(closest - current)
+        for floor in candidates:
+            distance = abs(floor - current)
+            if distance < closest_distance or \
+                    (distance == closest_distance and floor < closest):
+                closest = floor
+                closest_distance = distance
+        return closest
 
 
 if __name__ == '__main__':
@@ -331,7 +383,8 @@ if __name__ == '__main__':
     import python_ta
     python_ta.check_all(config={
         'allowed-io': ['__init__'],
-        'extra-imports': ['entities', 'random', 'csv', 'enum'],
+        'extra-imports': ['entities', 'random', 'csv', 'enum', 'numpy',
+                          'bisect'],
         'max-nested-blocks': 4,
         'disable': ['R0201'],
         'max-attributes': 12
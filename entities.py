@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import List
+from bisect import insort
+from collections import deque
+from typing import Deque, Dict, List, Optional
 from sprites import PersonSprite, ElevatorSprite
 
 
@@ -18,6 +20,7 @@ class Elevator(ElevatorSprite):
     len(self.passengers) <= self.max_capacity
     1 <= self.current_floor
     """
+    __slots__ = ('passengers', 'current_floor', 'max_capacity')
 
     passengers: List[Person]
     current_floor: int
@@ -48,12 +51,7 @@ class Elevator(ElevatorSprite):
 
     def get_direction(self, target: int) -> int:
         """Returns an int the elevator should go to get to a target floor."""
-        if target > self.current_floor:
-            return 1
-        if target < self.current_floor:
-            return -1
-        else:
-            return 0
+        return (target > self.current_floor) - (target < self.current_floor)
 
     def move(self, direction: int) -> None:
         """Move the elevator given an int for direction.
@@ -72,31 +70,91 @@ class Elevator(ElevatorSprite):
         self.passengers.remove(passenger)
 
 
+class WaitClock:
+    """A count of the rounds that have passed in a simulation, which the
+    wait times of the people in it are measured against.
+
+    === Attributes ===
+    rounds: the number of rounds counted so far
+
+    === Representation invariants ===
+    self.rounds >= 0
+    """
+    rounds: int
+
+    def __init__(self) -> None:
+        """Initializes a clock at round 0."""
+        self.rounds = 0
+
+
 class Person(PersonSprite):
     """A person in the elevator simulation.
 
+    While this person is waiting in a simulation, wait_time is computed from
+    the simulation's WaitClock, so it goes up each time the clock advances.
+
     === Attributes ===
     start: the floor this person started on
     target: the floor this person wants to go to
     wait_time: the number of rounds this person has been waiting
 
+    === Private Attributes ===
+    _clock: the clock this person's wait is measured against, or None if
+            they are not currently waiting in a simulation
+    _base: the wait time if _clock is None, and otherwise the value of
+           _clock.rounds at which the wait time was 0
+
     === Representation invariants ===
     self.start >= 1
     self.target >= 1
     self.wait_time >= 0
     self.start != self.target
     """
+    __slots__ = ('start', 'target', '_clock', '_base')
+
     start: int
     target: int
-    wait_time: int
+    _clock: Optional[WaitClock]
+    _base: int
+
+    # Anger level for each wait time below 9 rounds.
+    _ANGER_LUT = (0, 0, 0, 1, 1, 2, 2, 3, 3)
 
     def __init__(self, start: int, target: int) -> None:
         """Initializes a passenger. """
-        self.wait_time = 0
+        self._clock = None
+        self._base = 0
         PersonSprite.__init__(self)
         self.start = start
         self.target = target
 
+    @property
+    def wait_time(self) -> int:
+        """Return the number of rounds this person has been waiting."""
+        if self._clock is None:
+            return self._base
+        return self._clock.rounds - self._base
+
+    @wait_time.setter
+    def wait_time(self, wait_time: int) -> None:
+        """Set the number of rounds this person has been waiting."""
+        if self._clock is None:
+            self._base = wait_time
+        else:
+            self._base = self._clock.rounds - wait_time
+
+    def start_waiting(self, clock: WaitClock) -> None:
+        """Start counting this person's wait against the given clock."""
+        wait_time = self.wait_time
+        self._clock = clock
+        self.wait_time = wait_time
+
+    def stop_waiting(self) -> None:
+        """Stop counting this person's wait, keeping its current value."""
+        wait_time = self.wait_time
+        self._clock = None
+        self.wait_time = wait_time
+
     def get_anger_level(self) -> int:
         """Return this person's anger level.
 
@@ -108,22 +166,59 @@ class Person(PersonSprite):
             - Level 3: waiting 7-8 rounds
             - Level 4: waiting >= 9 rounds
         """
-        if self.wait_time <= 2:
-            return 0
-        if self.wait_time <= 4:
-            return 1
-        if self.wait_time <= 6:
-            return 2
-        if self.wait_time <= 8:
-            return 3
-        else:
-            return 4
+        wait_time = self.wait_time
+        if wait_time < len(self._ANGER_LUT):
+            return self._ANGER_LUT[wait_time]
+        return 4
+
+
+class WaitingFloors(Dict[int, Deque[Person]]):
+    """The people waiting for an elevator on each floor of a building.
+
+    This is a dictionary mapping each floor number to the queue of people
+    waiting on that floor, which also keeps track of the floors that have
+    anyone waiting. People should only be added and removed through
+    add_person and board, so that occupied_floors stays accurate.
+
+    === Attributes ===
+    occupied_floors: the floors with at least one person waiting, in
+                     increasing order
+
+    === Representation invariants ===
+    self.occupied_floors == sorted(floor for floor in self if self[floor])
+    """
+    occupied_floors: List[int]
+
+    def __init__(self, num_floors: int) -> None:
+        """Initialize an empty queue for each of floors 1 to num_floors."""
+        dict.__init__(self, ((floor, deque())
+                             for floor in range(1, num_floors + 1)))
+        self.occupied_floors = []
+
+    def add_person(self, floor: int, person: Person) -> None:
+        """Add a person to the back of the queue on the given floor."""
+        queue = self[floor]
+        if not queue:
+            insort(self.occupied_floors, floor)
+        queue.append(person)
+
+    def board(self, floor: int) -> Person:
+        """Remove and return the person at the front of the queue on the
+        given floor.
+
+        Precondition: at least one person is waiting on the given floor.
+        """
+        queue = self[floor]
+        person = queue.popleft()
+        if not queue:
+            self.occupied_floors.remove(floor)
+        return person
 
 
 if __name__ == '__main__':
     import python_ta
     python_ta.check_all(config={
-        'extra-imports': ['sprites'],
+        'extra-imports': ['sprites', 'bisect', 'collections'],
         'max-nested-blocks': 4,
         'disable': ['R0201'],
         'max-attributes': 12
@@ -1,11 +1,24 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 
 import algorithms
-from algorithms import Direction
-from entities import Person, Elevator
+from entities import Elevator, WaitClock, WaitingFloors
 from visualizer import Visualizer
 
 
+def _do_nothing(*_args: Any) -> None:
+    """Ignore the given arguments."""
+
+
+class _NullVisualizer:
+    """A stand-in for Visualizer when the simulation is not visualized.
+
+    Each method takes the same arguments as its Visualizer counterpart and
+    does nothing.
+    """
+    render_header = show_arrivals = show_disembarking = show_boarding = \
+        show_elevator_moves = wait = staticmethod(_do_nothing)
+
+
 class Simulation:
     """The main simulation class.
 
@@ -14,20 +27,31 @@ class Simulation:
     elevators: a list of the elevators in the simulation
     moving_algorithm: the algorithm used to decide how to move elevators
     num_floors: the number of floors
-    visualizer: the Pygame visualizer used to visualize this simulation
+    visualizer: the Pygame visualizer used to visualize this simulation,
+             or a stand-in that does nothing if it is not visualized
     waiting: a dictionary of people waiting for an elevator
-             (keys are floor numbers, values are the list of waiting people)
+             (keys are floor numbers, values are the queue of waiting people),
+             which also tracks the floors that have anyone waiting. People
+             must be added and removed through its add_person and board
+             methods; changing waiting[floor] directly leaves its
+             occupied_floors out of date.
     stats: a dictionary storing data to calculate statistics at the end of
-             the simulation.
+             the simulation. Completion times are kept as a running total,
+             minimum and maximum rather than as a list.
+
+    === Private Attributes ===
+    _wait_clock: the clock that the wait times of people in this
+             simulation are measured against
     """
 
     arrival_generator: algorithms.ArrivalGenerator
     elevators: List[Elevator]
     moving_algorithm: algorithms.MovingAlgorithm
     num_floors: int
-    visualizer: Visualizer
-    waiting: Dict[int, List[Person]]
+    visualizer: Union[Visualizer, _NullVisualizer]
+    waiting: WaitingFloors
     stats: Dict[str, Any]
+    _wait_clock: WaitClock
 
     def __init__(self,
                  config: Dict[str, Any]) -> None:
@@ -46,18 +70,25 @@ class Simulation:
 
         self.num_floors = config.get('num_floors')
 
-        self.waiting = {i: [] for i in range(1, config["num_floors"] + 1)}
+        self.waiting = WaitingFloors(config["num_floors"])
 
         self.stats = {
             "num_iterations": None,
             "total_people": 0,
             "total_completed": 0,
-            "times": []
+            "time_sum": 0,
+            "time_min": -1,
+            "time_max": -1
         }
 
-        self.visualizer = Visualizer(self.elevators,
-                                     self.num_floors,
-                                     config['visualize'])
+        self._wait_clock = WaitClock()
+
+        if config['visualize']:
+            self.visualizer = Visualizer(self.elevators,
+                                         self.num_floors,
+                                         True)
+        else:
+            self.visualizer = _NullVisualizer()
 
     ############################################################################
     # Handle rounds of simulation.
@@ -104,18 +135,28 @@ class Simulation:
         for floor in arrivals.keys():
             for person in arrivals[floor]:
                 self.stats["total_people"] += 1
-                self.waiting[floor].append(person)
+                person.start_waiting(self._wait_clock)
+                self.waiting.add_person(floor, person)
         self.visualizer.show_arrivals(arrivals)
 
     def _handle_leaving(self) -> None:
         """Handle people leaving elevators."""
         for elevator in self.elevators:
-            for passenger in reversed(elevator.passengers):
-                if passenger.target == elevator.current_floor:
-                    self.stats["total_completed"] += 1
-                    self.stats["times"].append(passenger.wait_time)
-                    elevator.unload(passenger)
-                    self.visualizer.show_disembarking(passenger, elevator)
+            floor = elevator.current_floor
+            staying = []
+            leaving = []
+            for passenger in elevator.passengers:
+                if passenger.target == floor:
+                    leaving.append(passenger)
+                else:
+                    staying.append(passenger)
+            if not leaving:
+                continue
+            elevator.passengers = staying
+            for passenger in leaving:
+                passenger.stop_waiting()
+                self._record_completion(passenger.wait_time)
+                self.visualizer.show_disembarking(passenger, elevator)
 
     def _handle_boarding(self) -> None:
         """Handle boarding of people and visualize."""
@@ -123,7 +164,7 @@ class Simulation:
             floor = elevator.current_floor
             people_on_floor = self.waiting[floor]
             while not elevator.is_full() and len(people_on_floor) != 0:
-                passenger = people_on_floor.pop(0)
+                passenger = self.waiting.board(floor)
                 elevator.load(passenger)
                 self.visualizer.show_boarding(passenger, elevator)
 
@@ -134,26 +175,38 @@ class Simulation:
         """
         directions = self.moving_algorithm.move_elevators(
             self.elevators, self.waiting, self.num_floors)
+        # Direction values are the floor offsets themselves.
         for elevator, direction in zip(self.elevators, directions):
-            if direction == Direction.UP:
-                elevator.move(1)
-            elif direction == Direction.DOWN:
-                elevator.move(-1)
+            elevator.current_floor += direction.value
 
         self.visualizer.show_elevator_moves(self.elevators, directions)
 
     def _increase_all_wait_times(self) -> None:
-        """Increases all the wait times for all the people currently active."""
-        for floor in self.waiting.keys():
-            for passenger in self.waiting[floor]:
-                passenger.wait_time += 1
-        for elevator in self.elevators:
-            for passenger in elevator.passengers:
-                passenger.wait_time += 1
+        """Increases all the wait times for all the people currently active.
+
+        The wait time of every active person is measured against this
+        simulation's wait clock, so advancing the clock by one round
+        increases all of them at once.
+        """
+        self._wait_clock.rounds += 1
 
     ############################################################################
     # Statistics calculations
     ############################################################################
+    def _record_completion(self, wait_time: int) -> None:
+        """Record that a person reached their target floor after waiting
+        wait_time rounds.
+        """
+        stats = self.stats
+        if stats["total_completed"] == 0:
+            stats["time_min"] = stats["time_max"] = wait_time
+        elif wait_time < stats["time_min"]:
+            stats["time_min"] = wait_time
+        elif wait_time > stats["time_max"]:
+            stats["time_max"] = wait_time
+        stats["total_completed"] += 1
+        stats["time_sum"] += wait_time
+
     def _calculate_stats(self) -> Dict[str, int]:
         """Report the statistics for the current run of this simulation.
         """
@@ -162,10 +215,10 @@ class Simulation:
             'num_iterations': stats["num_iterations"],
             'total_people': stats["total_people"],
             'people_completed': stats["total_completed"],
-            'max_time': max(stats["times"]) if stats["times"] else -1,
-            'min_time': min(stats["times"]) if stats["times"] else -1,
-            'avg_time': int(sum(stats["times"]) / len(stats["times"]))
-                        if stats["times"] else -1
+            'max_time': stats["time_max"],
+            'min_time': stats["time_min"],
+            'avg_time': int(stats["time_sum"] / stats["total_completed"])
+                        if stats["total_completed"] else -1
         }
 
 